@@ -6,4 +6,5 @@ Python implementation of Protocol Buffers data types.
 """
 
 import pure_protobuf.serializers.google  # noqa: F401
+from pure_protobuf.dataclasses_ import set_validation  # noqa: F401
 from pure_protobuf.serializers import read_varint, write_varint  # noqa: F401
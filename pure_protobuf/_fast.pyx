@@ -0,0 +1,178 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+
+"""
+Optional compiled accelerator for the varint codec.
+Built only if Cython is available at installation time. The pure Python implementation is used otherwise.
+
+Only values which fit into 64 bits are handled here: `OverflowError` is raised otherwise,
+so that callers are able to fall back to the pure Python implementation.
+
+`pure-protobuf` contributors © 2011-2022
+"""
+
+from cpython.buffer cimport PyBUF_SIMPLE, PyBuffer_Release, PyObject_GetBuffer
+from cpython.bytes cimport PyBytes_FromStringAndSize
+from libc.stdint cimport uint8_t, uint64_t
+from libc.stdlib cimport free, malloc
+
+
+cdef extern from *:
+    """
+    #include <stdint.h>
+    #include <string.h>
+    #if defined(__BMI2__)
+    #include <immintrin.h>
+    #endif
+
+    static inline uint64_t pp_load_le64(const uint8_t *data) {
+    #if defined(__BYTE_ORDER__) && __BYTE_ORDER__ == __ORDER_LITTLE_ENDIAN__
+        uint64_t word;
+        memcpy(&word, data, 8);
+        return word;
+    #else
+        uint64_t word = 0;
+        for (int i = 7; i >= 0; i--) {
+            word = (word << 8) | data[i];
+        }
+        return word;
+    #endif
+    }
+
+    static inline int pp_ctz64(uint64_t x) {
+    #if defined(__GNUC__) || defined(__clang__)
+        return __builtin_ctzll(x);
+    #else
+        int n = 0;
+        while (!(x & 1)) {
+            x >>= 1;
+            n++;
+        }
+        return n;
+    #endif
+    }
+
+    /*
+     * Decodes a varint from an 8-byte window without looping over its bytes.
+     * Returns the varint length, or 0 if it's longer than the window.
+     */
+    static inline int pp_decode_varint_window(const uint8_t *data, uint64_t *value) {
+        uint64_t word = pp_load_le64(data);
+        /* The most significant bit is cleared in the last byte of a varint. */
+        uint64_t stops = ~word & 0x8080808080808080ULL;
+        if (stops == 0) {
+            return 0;
+        }
+        /* Payload bits of the varint bytes, up to and including the first stop bit. */
+        uint64_t mask = (stops ^ (stops - 1)) & 0x7F7F7F7F7F7F7F7FULL;
+    #if defined(__BMI2__)
+        *value = _pext_u64(word, mask);
+    #else
+        uint64_t x = word & mask;
+        x = (x & 0x007F007F007F007FULL) | ((x & 0x7F007F007F007F00ULL) >> 1);
+        x = (x & 0x00003FFF00003FFFULL) | ((x & 0x3FFF00003FFF0000ULL) >> 2);
+        x = (x & 0x000000000FFFFFFFULL) | ((x & 0x0FFFFFFF00000000ULL) >> 4);
+        *value = x;
+    #endif
+        return (pp_ctz64(stops) + 1) >> 3;
+    }
+    """
+    int pp_decode_varint_window(const uint8_t* data, uint64_t* value) nogil
+
+
+cdef enum:
+    # Maximum length of an encoded 64-bit varint.
+    MAX_VARINT_SIZE = 10
+
+
+cdef inline Py_ssize_t _encode(uint64_t value, uint8_t* data) nogil:
+    cdef Py_ssize_t size = 0
+    while value > 0x7F:
+        data[size] = <uint8_t>((value & 0x7F) | 0x80)
+        value >>= 7
+        size += 1
+    data[size] = <uint8_t>value
+    return size + 1
+
+
+cdef inline Py_ssize_t _decode(const uint8_t* data, Py_ssize_t size, Py_ssize_t position, uint64_t* value) except -1:
+    cdef uint64_t result = 0
+    cdef unsigned int shift = 0
+    cdef uint8_t byte
+    cdef int length
+    if size - position >= 8:
+        # Branchless decoding of varints up to 8 bytes long, which covers values of up to 56 bits.
+        length = pp_decode_varint_window(data + position, value)
+        if length != 0:
+            return position + length
+    while True:
+        if position >= size:
+            raise ValueError('unexpected end of input')
+        byte = data[position]
+        position += 1
+        if shift == 63 and byte > 1:
+            raise OverflowError('varint does not fit into 64 bits')
+        result |= (<uint64_t>(byte & 0x7F)) << shift
+        if byte < 0x80:
+            value[0] = result
+            return position
+        shift += 7
+
+
+def encode_varint(uint64_t value):
+    """
+    Encodes an unsigned varint into a byte string.
+    """
+    cdef uint8_t data[MAX_VARINT_SIZE]
+    return PyBytes_FromStringAndSize(<char*>data, _encode(value, data))
+
+
+def decode_varint(buffer, Py_ssize_t position):
+    """
+    Decodes an unsigned varint at the position of a bytes-like object.
+    Returns the value and the position right after it.
+    """
+    cdef Py_buffer view
+    cdef uint64_t value
+    PyObject_GetBuffer(buffer, &view, PyBUF_SIMPLE)
+    try:
+        position = _decode(<const uint8_t*>view.buf, view.len, position, &value)
+    finally:
+        PyBuffer_Release(&view)
+    return value, position
+
+
+def encode_varints(values):
+    """
+    Encodes a sequence of unsigned varints into a single byte string, as in a packed repeated field.
+    """
+    cdef Py_ssize_t capacity = len(values) * MAX_VARINT_SIZE
+    cdef Py_ssize_t size = 0
+    cdef uint8_t* data = <uint8_t*>malloc(capacity + 1)
+    if data == NULL:
+        raise MemoryError()
+    try:
+        for value in values:
+            if size + MAX_VARINT_SIZE > capacity:
+                raise ValueError('sequence changed size during iteration')
+            size += _encode(<uint64_t>value, data + size)
+        return PyBytes_FromStringAndSize(<char*>data, size)
+    finally:
+        free(data)
+
+
+def decode_varints(buffer):
+    """
+    Decodes all unsigned varints of a bytes-like object, as in a packed repeated field.
+    """
+    cdef Py_buffer view
+    cdef Py_ssize_t position = 0
+    cdef uint64_t value
+    cdef list values = []
+    PyObject_GetBuffer(buffer, &view, PyBUF_SIMPLE)
+    try:
+        while position < view.len:
+            position = _decode(<const uint8_t*>view.buf, view.len, position, &value)
+            values.append(value)
+    finally:
+        PyBuffer_Release(&view)
+    return values
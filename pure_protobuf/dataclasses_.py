@@ -5,15 +5,41 @@ Python 3.6+ type hinting interface.
 """
 
 from abc import ABC
+from array import array
 from collections import abc
 from enum import IntEnum
 from io import BytesIO
-from typing import Any, ByteString, ClassVar, Dict, Iterable, List, Tuple, Type, TypeVar, Union, cast, get_type_hints
+from struct import calcsize
+from typing import (
+    Any,
+    ByteString,
+    Callable,
+    ClassVar,
+    Dict,
+    ForwardRef,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    cast,
+    get_type_hints,
+)
 
 from pure_protobuf import serializers, types
 from pure_protobuf.enums import WireType
-from pure_protobuf.fields import Field, NonRepeatedField, PackedRepeatedField, UnpackedRepeatedField
-from pure_protobuf.io_ import IO
+from pure_protobuf.fields import (
+    Field,
+    NonRepeatedField,
+    PackedFixedRepeatedField,
+    PackedRepeatedField,
+    PackedUnsignedVarintRepeatedField,
+    RepeatedField,
+    UnpackedRepeatedField,
+)
+from pure_protobuf.io_ import BytesReader, BytesWriter, ReadIO, WriteIO
 from pure_protobuf.serializers import IntEnumSerializer, MessageSerializer, PackingSerializer, Serializer
 from pure_protobuf.types import NoneType
 
@@ -27,6 +53,20 @@ T = TypeVar('T')
 TMessage = TypeVar('TMessage', bound='Message')
 
 
+# Whether messages are validated before serialization, unless specified otherwise.
+VALIDATION = True
+
+
+def set_validation(enabled: bool):
+    """
+    Sets whether messages are validated before serialization by default.
+    Disabling validation saves a pass over the message fields,
+    but then invalid values may get silently serialized incorrectly.
+    """
+    global VALIDATION
+    VALIDATION = enabled
+
+
 @dataclasses.dataclass
 class Message(ABC):
     """
@@ -35,27 +75,39 @@ class Message(ABC):
     """
 
     __protobuf_fields__: Dict[int, Field]
+    __protobuf_fields_list__: ClassVar[Tuple[Field, ...]]
+    __protobuf_parse_table__: ClassVar[List[Optional[Tuple[Field, WireType]]]]
     serializer: ClassVar[Serializer]
     type_url: ClassVar[str]
 
     def validate(self):
         self.serializer.validate(self)
 
-    def dump(self, io: IO):
+    def dump(self, io: WriteIO, *, validate: Optional[bool] = None):
         """
         Serializes a message into a file-like object.
+        Validates the message first, unless ``validate`` is false.
+        If ``validate`` is not specified, the default set by ``set_validation`` is used.
         """
-        self.validate()
+        if VALIDATION if validate is None else validate:
+            self.validate()
         self.serializer.dump(self, io)
 
-    def dumps(self) -> bytes:
+    def dumps(self, *, validate: Optional[bool] = None) -> bytes:
         """
         Serializes a message into a byte string.
         """
         with BytesIO() as io:
-            self.dump(io)
+            self.dump(io, validate=validate)
             return io.getvalue()
 
+    def dump_into(self, buffer: bytearray, *, validate: Optional[bool] = None):
+        """
+        Serializes a message by appending it to the byte array.
+        Allows re-using a pre-allocated buffer or writing many messages into a single one.
+        """
+        self.dump(BytesWriter(buffer), validate=validate)
+
     def merge_from(self: TMessage, other: TMessage):
         """
         Merge another message into the current one, as if with the ``Message::MergeFrom`` method.
@@ -87,7 +139,24 @@ class OneOf:
         return None
 
 
-def load(cls: Type[TMessage], io: IO) -> TMessage:
+class TypeUrl:
+    """
+    Lazily formats a message type URL, since it's only needed for the ``Any`` type.
+    The URL is cached in the message class on first access, replacing the descriptor.
+    """
+
+    def __get__(self, instance: Any, owner: Type) -> str:
+        # The URL refers to the class decorated with `@message`, even if accessed via a subclass.
+        cls = next(class_ for class_ in owner.__mro__ if class_.__dict__.get('type_url') is self)
+        type_url = f'type.googleapis.com/{cls.__module__}.{cls.__name__}'
+        cls.type_url = type_url  # type: ignore
+        return type_url
+
+
+TYPE_URL = TypeUrl()
+
+
+def load(cls: Type[TMessage], io: ReadIO) -> TMessage:
     """
     Deserializes a message from a file-like object.
     """
@@ -98,16 +167,27 @@ def loads(cls: Type[TMessage], bytes_: bytes) -> TMessage:
     """
     Deserializes a message from a byte string.
     """
-    with BytesIO(bytes_) as io:
-        return load(cls, io)
+    return load(cls, BytesReader(bytes_))
+
+
+# Attributes which are the same for every message class.
+MESSAGE_MIXIN: Dict[str, Any] = {
+    'type_url': TYPE_URL,
+    'validate': Message.validate,
+    'load': classmethod(load),
+    'loads': classmethod(loads),
+}
 
 
-def field(number: int, *args, packed=True, **kwargs) -> Any:
+def field(number: int, *args, packed=True, lazy_bytes=False, container=list, **kwargs) -> Any:
     """
     Convenience function to assign field numbers.
     Calls the standard ``dataclasses.field`` function with the metadata assigned.
+    With ``lazy_bytes``, a byte string field is deserialized as a ``memoryview`` of the input, without copying.
+    With ``container=array.array``, a repeated numeric field is deserialized into a compact ``array.array``.
     """
-    return dataclasses.field(*args, metadata={'number': number, 'packed': packed}, **kwargs)
+    metadata = {'number': number, 'packed': packed, 'lazy_bytes': lazy_bytes, 'container': container}
+    return dataclasses.field(*args, metadata=metadata, **kwargs)
 
 
 def optional_field(number: int, *args, **kwargs) -> Any:
@@ -123,34 +203,237 @@ def message(cls: Type[T]) -> Type[TMessage]:
     serialization and deserialization.
     """
 
-    type_hints = get_type_hints(cls)
+    type_hints = get_annotations(cls)
 
     # Used to list all fields and locate fields by field number.
     cast(Type[TMessage], cls).__protobuf_fields__ = dict(
-        make_field(field_.metadata['number'], field_.name, type_hints[field_.name], field_.metadata['packed'])
+        make_field(
+            field_.metadata['number'],
+            field_.name,
+            type_hints[field_.name],
+            field_.metadata['packed'],
+            field_.metadata.get('lazy_bytes', False),
+            field_.metadata.get('container', list),
+        )
         for field_ in dataclasses.fields(cls)
     )
+    # Used to iterate over the fields, which is faster with a tuple than with a dictionary view.
+    cls.__protobuf_fields_list__ = tuple(cls.__protobuf_fields__.values())  # type: ignore
+    # Used to dispatch on field keys read from the wire without splitting them into number and wire type.
+    cls.__protobuf_parse_table__ = make_parse_table(cls.__protobuf_fields_list__)  # type: ignore
 
     Message.register(cls)  # type: ignore
-    cls.serializer = MessageSerializer(cls)  # type: ignore
-    cls.type_url = f'type.googleapis.com/{cls.__module__}.{cls.__name__}'  # type: ignore
-    cls.validate = Message.validate  # type: ignore
-    cls.dump = Message.dump  # type: ignore
-    cls.dumps = Message.dumps  # type: ignore
-    cls.merge_from = Message.merge_from  # type: ignore
-    cls.load = classmethod(load)  # type: ignore
-    cls.loads = classmethod(loads)  # type: ignore
+    serializer = MessageSerializer(cls)
+    maybe_validate = _make_validate(serializer)
+    attributes = {
+        **MESSAGE_MIXIN,
+        'serializer': serializer,
+        'dump': _make_dump(serializer, maybe_validate),
+        'dumps': _make_dumps(serializer, maybe_validate),
+        'dump_into': _make_dump_into(serializer, maybe_validate),
+        'merge_from': _make_merge_from(cls),
+    }
+    for name, value in attributes.items():
+        setattr(cls, name, value)
 
     return cast(Type[TMessage], cls)
 
 
-def make_field(number: int, name: str, type_: Any, packed: bool = True) -> Tuple[int, Field]:
+def make_parse_table(fields: Iterable[Field]) -> List[Optional[Tuple[Field, WireType]]]:
+    """
+    Builds a list indexed by field key, that is by field number and wire type combined as on the wire.
+    Each entry is a field and the wire type it is loaded with, or ``None`` if the key is unexpected.
+    Keys of large field numbers are left out of the table.
+    """
+    entries: Dict[int, Tuple[Field, WireType]] = {}
+    for field_ in fields:
+        wire_types = [field_.serializer.wire_type]
+        if isinstance(field_, RepeatedField) and field_.serializer.wire_type != WireType.BYTES:
+            # Repeated scalar values may be packed or not regardless of the field definition.
+            wire_types.append(WireType.BYTES)
+        for wire_type in wire_types:
+            key = (field_.number << 3) | wire_type
+            if key < MAX_PARSE_TABLE_SIZE:
+                entries[key] = (field_, wire_type)
+    parse_table: List[Optional[Tuple[Field, WireType]]] = [None] * (max(entries, default=-1) + 1)
+    for key, entry in entries.items():
+        parse_table[key] = entry
+    return parse_table
+
+
+# Keys of field numbers up to 63. Other fields are looked up by number in a dictionary.
+MAX_PARSE_TABLE_SIZE = 64 << 3
+
+
+# Validates a message before serialization, depending on the `validate` argument and the default.
+MaybeValidate = Callable[[Any, Optional[bool]], None]
+
+
+def _make_validate(serializer: MessageSerializer) -> MaybeValidate:
+    """
+    Makes the validation step shared by the specialized ``dump``, ``dumps`` and ``dump_into``.
+    It validates a message unless ``validate`` is false, or unspecified while disabled by ``set_validation``.
+    """
+    validate_, type_ = serializer.validate, serializer.type_
+
+    def maybe_validate(self: Any, validate: Optional[bool]):
+        if VALIDATION if validate is None else validate:
+            if type(self) is type_:
+                validate_(self)
+            else:
+                # An undecorated subclass may override `validate()`.
+                self.validate()
+
+    return maybe_validate
+
+
+def _make_dump(serializer: MessageSerializer, maybe_validate: MaybeValidate) -> Callable[..., None]:
+    """
+    Specializes ``Message.dump`` for the message serializer.
+    The serializer methods are bound once instead of being looked up on every call.
+    """
+    dump_ = serializer.dump
+
+    def dump(self: Any, io: WriteIO, *, validate: Optional[bool] = None):
+        maybe_validate(self, validate)
+        dump_(self, io)
+
+    dump.__doc__ = Message.dump.__doc__
+    return dump
+
+
+def _make_dumps(serializer: MessageSerializer, maybe_validate: MaybeValidate) -> Callable[..., bytes]:
+    """
+    Specializes ``Message.dumps`` for the message serializer.
+    """
+    dump_ = serializer.dump
+
+    def dumps(self: Any, *, validate: Optional[bool] = None) -> bytes:
+        maybe_validate(self, validate)
+        io = BytesIO()
+        dump_(self, io)
+        return io.getvalue()
+
+    dumps.__doc__ = Message.dumps.__doc__
+    return dumps
+
+
+def _make_dump_into(serializer: MessageSerializer, maybe_validate: MaybeValidate) -> Callable[..., None]:
+    """
+    Specializes ``Message.dump_into`` for the message serializer.
+    """
+    dump_ = serializer.dump
+
+    def dump_into(self: Any, buffer: bytearray, *, validate: Optional[bool] = None):
+        maybe_validate(self, validate)
+        dump_(self, BytesWriter(buffer))
+
+    dump_into.__doc__ = Message.dump_into.__doc__
+    return dump_into
+
+
+def _make_merge_from(cls: Type) -> Callable[[Any, Any], None]:
+    """
+    Makes a ``Message.merge_from`` stub which generates the actual method on the first call
+    and replaces itself with it. ``exec`` is expensive, so it's only run for the classes which need it.
+    """
+
+    def merge_from(self: Any, other: Any):
+        generated = _generate_merge_from(cls.__protobuf_fields_list__)
+        cls.merge_from = generated
+        generated(self, other)
+
+    merge_from.__doc__ = Message.merge_from.__doc__
+    return merge_from
+
+
+def _generate_merge_from(fields: Iterable[Field]) -> Callable[[Any, Any], None]:
+    """
+    Generates ``Message.merge_from`` as straight-line code for the specific fields,
+    instead of looping over the fields with ``getattr`` and ``setattr``.
+    """
+    merges: Dict[str, Callable[[Any, Any], Any]] = {}
+    lines: List[str] = []
+    for i, field_ in enumerate(fields):
+        merges[f'merge_{i}'] = field_.merge
+        lines.append(f'        self.{field_.name} = merge_{i}(self.{field_.name}, other.{field_.name})')
+    source = '\n'.join([
+        f'def make_merge_from({", ".join(merges)}):',
+        '    def merge_from(self, other):',
+        *(lines or ['        pass']),
+        '    return merge_from',
+    ])
+    namespace: Dict[str, Any] = {}
+    exec(source, namespace)  # skipcq: PYL-W0122
+    merge_from = namespace['make_merge_from'](**merges)
+    merge_from.__doc__ = Message.merge_from.__doc__
+    return merge_from
+
+
+def get_annotations(cls: Type) -> Dict[str, Any]:
+    """
+    Collects the class annotations, including inherited ones, as they are.
+    Only falls back to the much slower ``get_type_hints`` if there's a forward reference to resolve
+    or an ``Annotated`` wrapper to strip.
+    """
+    annotations: Dict[str, Any] = {}
+    for class_ in reversed(cls.__mro__):
+        annotations.update(getattr(class_, '__annotations__', {}))
+    if any(needs_type_hints(type_) for type_ in annotations.values()):
+        return get_type_hints(cls)
+    return annotations
+
+
+def needs_type_hints(type_: Any) -> bool:
+    """
+    Checks whether the type annotation contains a string, ``ForwardRef`` or ``Annotated`` anywhere.
+    """
+    if isinstance(type_, (str, ForwardRef)) or hasattr(type_, '__metadata__'):
+        return True
+    return any(needs_type_hints(arg) for arg in getattr(type_, '__args__', ()))
+
+
+def make_field(
+    number: int,
+    name: str,
+    type_: Any,
+    packed: bool = True,
+    lazy_bytes: bool = False,
+    container: type = list,
+) -> Tuple[int, Field]:
     """
     Figure out how to serialize and de-serialize the field.
     Returns the field number and a corresponding ``Field`` instance.
+
+    Fields of predefined types are cached: fields are immutable and may be shared between message classes.
+    Fields of embedded messages and enumerations are not, so that user-defined classes don't get kept alive.
+    """
+    key = (number, name, type_, packed, lazy_bytes, container)
+    result = FIELDS_CACHE_GET(key)
+    if result is None:
+        result = build_field(number, name, type_, packed, lazy_bytes, container)
+        if not isinstance(result[1].serializer, (PackingSerializer, IntEnumSerializer)):
+            FIELDS_CACHE[key] = result
+    return result
+
+
+# Cached fields of predefined types by the `make_field` arguments.
+FIELDS_CACHE: Dict[Tuple[Any, ...], Tuple[int, Field]] = {}
+FIELDS_CACHE_GET = FIELDS_CACHE.get
+
+
+def build_field(
+    number: int,
+    name: str,
+    type_: Any,
+    packed: bool,
+    lazy_bytes: bool,
+    container: type,
+) -> Tuple[int, Field]:
     """
-    is_optional, type_ = get_optional(type_)
-    is_repeated, type_ = get_repeated(type_)
+    Builds a field for ``make_field`` without caching.
+    """
+    is_optional, is_repeated, type_ = decompose_type(type_)
 
     serializer: Serializer
     if isinstance(type_, type) and issubclass(type_, Message):
@@ -162,10 +445,23 @@ def make_field(number: int, name: str, type_: Any, packed: bool = True) -> Tuple
         serializer = IntEnumSerializer(type_)
     else:
         # Predefined type.
-        try:
-            serializer = SERIALIZERS[type_]
-        except KeyError as e:
-            raise TypeError(f'type is not serializable: {type_}') from e
+        predefined_serializer = SERIALIZERS_GET(type_)
+        if predefined_serializer is None:
+            raise TypeError(f'type is not serializable: {type_}')
+        serializer = predefined_serializer
+
+    if lazy_bytes:
+        if serializer is not serializers.bytes_serializer:
+            raise TypeError(f'lazy loading is only supported for byte strings, not {type_}')
+        serializer = serializers.lazy_bytes_serializer
+
+    if container is not list:
+        if container is not array:
+            raise TypeError(f'container must be either list or array.array, not {container}')
+        if not is_repeated or serializer.typecode is None:
+            raise TypeError(f'array container is only supported for repeated sized numeric fields, not {type_}')
+        if array(serializer.typecode).itemsize != calcsize(f'<{serializer.typecode}'):
+            raise TypeError(f'array type code {serializer.typecode!r} has platform-specific size')
 
     if not is_repeated:
         # Non-repeated field.
@@ -173,39 +469,44 @@ def make_field(number: int, name: str, type_: Any, packed: bool = True) -> Tuple
     elif serializer.wire_type != WireType.BYTES and packed:
         # Repeated fields of scalar numeric types are packed by default.
         # See also: https://developers.google.com/protocol-buffers/docs/encoding#packed
-        return number, PackedRepeatedField(number, name, serializer)
+        if serializer.typecode is not None and serializer.wire_type != WireType.VARINT:
+            # Fixed-width values are converted in bulk.
+            return number, PackedFixedRepeatedField(number, name, serializer, container)
+        if PackedUnsignedVarintRepeatedField.is_available and isinstance(serializer, UNSIGNED_VARINT_SERIALIZERS):
+            # Unsigned varints are converted in bulk by the compiled accelerator.
+            return number, PackedUnsignedVarintRepeatedField(number, name, serializer, container)
+        return number, PackedRepeatedField(number, name, serializer, container)
     else:
         # Repeated field of other type.
-        return number, UnpackedRepeatedField(number, name, serializer)
+        return number, UnpackedRepeatedField(number, name, serializer, container=container)
 
 
-def get_optional(type_: Any) -> Tuple[bool, Any]:
+def decompose_type(type_: Any) -> Tuple[bool, bool, Any]:
     """
-    Extracts ``Optional`` type annotation if present.
-    This may be useful if a user wants to annotate a field with ``Optional[...]`` and set default to ``None``.
+    Extracts ``Optional`` type annotation and ``repeated`` modifier if present, in a single pass.
+    Returns whether the type is optional, whether it's repeated, and the inner type.
+    Optional type may be useful if a user wants to annotate a field with ``Optional[...]`` and set default to ``None``.
     """
-    if getattr(type_, '__origin__', None) is Union:
-        args = set(type_.__args__)
+    is_optional = False
+    origin = getattr(type_, '__origin__', None)
 
+    if origin is Union:
+        args = type_.__args__
         # Check if it's a union of `NoneType` and something else.
         if len(args) == 2 and NoneType in args:
             # Extract inner type.
-            type_, = args - {NoneType}
-            return True, type_
-
-    return False, type_
-
+            type_ = args[0] if args[1] is NoneType else args[1]
+            is_optional = True
+            origin = getattr(type_, '__origin__', None)
 
-def get_repeated(type_: Any) -> Tuple[bool, Any]:
-    """
-    Extracts ``repeated`` modifier if present.
-    """
-    if getattr(type_, '__origin__', None) in (list, List, Iterable, abc.Iterable):
+    if origin in REPEATED_ORIGINS:
         type_, = type_.__args__
-        return True, type_
-    else:
-        return False, type_
+        return is_optional, True, type_
+    return is_optional, False, type_
+
 
+# Generic origins which denote a repeated field.
+REPEATED_ORIGINS = (list, List, Iterable, abc.Iterable)
 
 SERIALIZERS: Dict[Any, Serializer] = {
     bool: serializers.BooleanSerializer(),
@@ -227,6 +528,16 @@ SERIALIZERS: Dict[Any, Serializer] = {
     # TODO: `map`.
 }
 
+# Bound once, since the lookup is done for every predefined field type.
+SERIALIZERS_GET = SERIALIZERS.get
+
+# Serializers which write values as is, without any conversion.
+UNSIGNED_VARINT_SERIALIZERS = (
+    serializers.UnsignedVarintSerializer,
+    serializers.UnsignedInt32Serializer,
+    serializers.UnsignedInt64Serializer,
+)
+
 __all__ = [
     'field',
     'load',
@@ -3,22 +3,47 @@
 """
 
 from abc import ABC, abstractmethod
+from array import array
+from collections.abc import Sized
 from io import BytesIO
-from typing import Any, Iterable
+from itertools import chain
+from struct import calcsize, pack, unpack
+from sys import byteorder
+from typing import Any, Iterable, Optional
 
 from pure_protobuf.enums import WireType
-from pure_protobuf.io_ import IO, Dumps
+from pure_protobuf.io_ import BytesLike, BytesReader, Dumps, ReadIO, WriteIO
 from pure_protobuf.serializers import Serializer, bytes_serializer, unsigned_varint_serializer
 
+try:
+    from pure_protobuf._fast import decode_varints, encode_varints
+except ImportError:
+    # The compiled accelerator is optional and may not be built.
+    decode_varints = encode_varints = None
+
+# Values are stored in the native byte order in an `array.array`, but protocol buffers are little-endian.
+IS_BIG_ENDIAN = byteorder == 'big'
+
+
+def is_array_of(value: Any, typecode: Optional[str]) -> bool:
+    """
+    Checks whether the value is an `array.array` of the type code.
+    """
+    return isinstance(value, array) and value.typecode == typecode
+
 
 # TODO: perhaps it's good to add a type parameter:
 # TODO: https://docs.python.org/3/library/typing.html#user-defined-generic-types
 class Field(Dumps, ABC):
-    def __init__(self, number: int, name: str, serializer: Serializer):
+    __slots__ = ('number', 'name', 'serializer', 'wire_type', 'encoded_key')
+
+    def __init__(self, number: int, name: str, serializer: Serializer, wire_type: Optional[WireType] = None):
         self.number = number
         self.name = name
         self.serializer = serializer
-        self.wire_type = serializer.wire_type
+        self.wire_type = serializer.wire_type if wire_type is None else wire_type
+        # The key never changes, thus it's encoded only once.
+        self.encoded_key = unsigned_varint_serializer.dumps((number << 3) | self.wire_type)
 
     @abstractmethod
     def validate(self, value: Any):
@@ -28,20 +53,20 @@ class Field(Dumps, ABC):
         raise NotImplementedError()
 
     @abstractmethod
-    def dump(self, value: Any, io: IO):
+    def dump(self, value: Any, io: WriteIO):
         """
         Serializes a value into a file-like object.
         """
         raise NotImplementedError()
 
-    def dump_key(self, io: IO):
+    def dump_key(self, io: WriteIO):
         """
         Serializes field key: number and wire type.
         """
-        unsigned_varint_serializer.dump((self.number << 3) | self.wire_type, io)
+        io.write(self.encoded_key)
 
     @abstractmethod
-    def load(self, wire_type: WireType, io: IO) -> Any:
+    def load(self, wire_type: WireType, io: ReadIO) -> Any:
         """
         Deserializes a field value from a file-like object.
         Accepts received wire type.
@@ -63,6 +88,8 @@ class NonRepeatedField(Field):
     See also: https://developers.google.com/protocol-buffers/docs/encoding#optional
     """
 
+    __slots__ = ('is_optional',)
+
     def __init__(self, number: int, name: str, serializer: Serializer, is_optional: bool):
         super().__init__(number, name, serializer)
         self.is_optional = is_optional
@@ -71,12 +98,12 @@ class NonRepeatedField(Field):
         if value is not None or not self.is_optional:
             self.serializer.validate(value)
 
-    def dump(self, value: Any, io: IO):
+    def dump(self, value: Any, io: WriteIO):
         if value is not None:
-            self.dump_key(io)
+            io.write(self.encoded_key)
             self.serializer.dump(value, io)
 
-    def load(self, wire_type: WireType, io: IO) -> Any:
+    def load(self, wire_type: WireType, io: ReadIO) -> Any:
         if wire_type != self.serializer.wire_type:
             raise ValueError(f'expected {self.serializer.wire_type}, got {wire_type}')
         return self.serializer.load(io)
@@ -91,32 +118,70 @@ class RepeatedField(Field, ABC):
     See also: https://developers.google.com/protocol-buffers/docs/encoding#optional
     """
 
+    __slots__ = ('container',)
+
+    def __init__(
+        self,
+        number: int,
+        name: str,
+        serializer: Serializer,
+        wire_type: Optional[WireType] = None,
+        container: type = list,
+    ):
+        super().__init__(number, name, serializer, wire_type)
+        # Either `list` or `array.array`.
+        self.container = container
+
     def validate(self, value: Any):
         for item in value:
             self.serializer.validate(item)
 
-    def load(self, wire_type: WireType, io: IO) -> Any:
+    def load(self, wire_type: WireType, io: ReadIO) -> Any:
         if self.serializer.wire_type != WireType.BYTES and wire_type == WireType.BYTES:
             # Protocol buffer parsers must be able to parse repeated fields
             # that were compiled as packed as if they were not packed, and vice versa.
             # See also: https://developers.google.com/protocol-buffers/docs/encoding#packed
-            return list(self.load_packed(bytes_serializer.load(io)))
+            # Pass the payload through without copying it.
+            return self.load_container(io.read(unsigned_varint_serializer.load(io)))
         if wire_type == self.serializer.wire_type:
-            return [self.serializer.load(io)]
+            return self.make_container((self.serializer.load(io),))
         raise ValueError(f'expected {self.serializer.wire_type} or {WireType.BYTES}, got {wire_type}')
 
-    def load_packed(self, bytes_: bytes) -> Iterable[Any]:
+    def make_container(self, values: Iterable[Any]) -> Any:
+        """
+        Collects deserialized values into the field container.
+        """
+        if self.container is list:
+            return list(values)
+        typecode = self.serializer.typecode
+        try:
+            return array(typecode, values)  # type: ignore
+        except OverflowError as e:
+            raise ValueError(f'value is out of range of the array type code {typecode!r}: {e}') from e
+
+    def load_container(self, bytes_: BytesLike) -> Any:
+        """
+        Deserializes repeated values from a packed byte string into the field container.
+        """
+        return self.make_container(self.load_packed(bytes_))
+
+    def load_packed(self, bytes_: BytesLike) -> Iterable[Any]:
         """
         Deserializes repeated values from a packed byte string.
         """
-        with BytesIO(bytes_) as io:
-            while io.tell() < len(bytes_):
-                yield self.serializer.load(io)
+        io = BytesReader(bytes_)
+        load, end = self.serializer.load, len(io.view)
+        while io.position < end:
+            yield load(io)
 
     def merge(self, old_value: Any, new_value: Any) -> Any:
-        if old_value is not None:
+        if old_value is None:
+            return new_value
+        if self.container is list:
             return [*old_value, *new_value]
-        return new_value
+        if is_array_of(old_value, self.serializer.typecode) and is_array_of(new_value, self.serializer.typecode):
+            return old_value + new_value
+        return self.make_container(chain(old_value, new_value))
 
 
 class UnpackedRepeatedField(RepeatedField):
@@ -124,10 +189,13 @@ class UnpackedRepeatedField(RepeatedField):
     See also: https://developers.google.com/protocol-buffers/docs/encoding#optional
     """
 
-    def dump(self, value: Any, io: IO):
+    __slots__ = ()
+
+    def dump(self, value: Any, io: WriteIO):
+        encoded_key, dump = self.encoded_key, self.serializer.dump
         for item in value:
-            self.dump_key(io)
-            self.serializer.dump(item, io)
+            io.write(encoded_key)
+            dump(item, io)
 
 
 class PackedRepeatedField(RepeatedField):
@@ -136,13 +204,84 @@ class PackedRepeatedField(RepeatedField):
     See also: https://developers.google.com/protocol-buffers/docs/encoding#packed
     """
 
-    def __init__(self, number: int, name: str, serializer: Serializer):
-        super().__init__(number, name, serializer)
-        self.wire_type = WireType.BYTES
-
-    def dump(self, value: Any, io: IO):
-        with BytesIO() as inner_io:
-            for item in value:
-                self.serializer.dump(item, inner_io)
-            self.dump_key(io)
-            bytes_serializer.dump(inner_io.getvalue(), io)
+    __slots__ = ()
+
+    def __init__(self, number: int, name: str, serializer: Serializer, container: type = list):
+        super().__init__(number, name, serializer, WireType.BYTES, container)
+
+    def dump(self, value: Any, io: WriteIO):
+        inner_io = BytesIO()
+        for item in value:
+            self.serializer.dump(item, inner_io)
+        io.write(self.encoded_key)
+        bytes_serializer.dump(inner_io.getvalue(), io)
+
+
+class PackedFixedRepeatedField(PackedRepeatedField):
+    """
+    Packs and unpacks fixed-width values with a single `struct` call instead of item by item.
+    An `array.array` is copied to and from the wire as is, apart from the byte order.
+    """
+
+    __slots__ = ('typecode', 'size')
+
+    def __init__(self, number: int, name: str, serializer: Serializer, container: type = list):
+        super().__init__(number, name, serializer, container)
+        assert serializer.typecode is not None, 'fixed-width serializer is expected'
+        self.typecode = serializer.typecode
+        self.size = calcsize(f'<{self.typecode}')
+
+    def dump(self, value: Any, io: WriteIO):
+        io.write(self.encoded_key)
+        if is_array_of(value, self.typecode) and value.itemsize == self.size:
+            if IS_BIG_ENDIAN:
+                value = array(value.typecode, value)
+                value.byteswap()
+            bytes_serializer.dump(value.tobytes(), io)
+        else:
+            if not isinstance(value, Sized):
+                # Any iterable is allowed as a repeated value, including generators.
+                value = list(value)
+            bytes_serializer.dump(pack(f'<{len(value)}{self.typecode}', *value), io)
+
+    def load_container(self, bytes_: BytesLike) -> Any:
+        if self.container is list:
+            return list(self.load_packed(bytes_))
+        values = array(self.typecode)
+        values.frombytes(bytes_)
+        if IS_BIG_ENDIAN:
+            values.byteswap()
+        return values
+
+    def load_packed(self, bytes_: BytesLike) -> Iterable[Any]:
+        return unpack(f'<{len(bytes_) // self.size}{self.typecode}', bytes_)
+
+
+class PackedUnsignedVarintRepeatedField(PackedRepeatedField):
+    """
+    Packs and unpacks unsigned varints in bulk with the compiled accelerator.
+    Falls back to item-by-item conversion for values which don't fit into 64 bits.
+    """
+
+    __slots__ = ()
+
+    # Whether the compiled accelerator is available.
+    is_available = encode_varints is not None
+
+    def dump(self, value: Any, io: WriteIO):
+        if not isinstance(value, Sized):
+            # The accelerator needs the item count, and the fallback needs to iterate over the values again.
+            value = list(value)
+        try:
+            packed = encode_varints(value)
+        except OverflowError:
+            super().dump(value, io)
+        else:
+            io.write(self.encoded_key)
+            bytes_serializer.dump(packed, io)
+
+    def load_packed(self, bytes_: BytesLike) -> Iterable[Any]:
+        try:
+            return decode_varints(bytes_)
+        except OverflowError:
+            return super().load_packed(bytes_)
@@ -9,10 +9,58 @@ from typing import Any, BinaryIO, Union
 # Type hinting doesn't recognize `BytesIO` as an instance of `BinaryIO`.
 IO = Union[BinaryIO, BytesIO]
 
+# Byte strings and zero-copy slices of them.
+BytesLike = Union[bytes, memoryview]
+
+# File-like objects which values are deserialized from, including the zero-copy reader.
+ReadIO = Union[IO, 'BytesReader']
+
+# File-like objects which values are serialized into, including the byte array writer.
+WriteIO = Union[IO, 'BytesWriter']
+
+
+class BytesWriter:
+    """
+    Minimal write-only file-like adapter which appends to a `bytearray`.
+    """
+
+    __slots__ = ('write',)
+
+    def __init__(self, buffer: bytearray):
+        self.write = buffer.extend
+
+
+class BytesReader:
+    """
+    Minimal read-only file-like adapter over a bytes-like object.
+    Reads return `memoryview` slices of the underlying buffer instead of copies.
+    """
+
+    __slots__ = ('view', 'position')
+
+    def __init__(self, bytes_: Any):
+        view = memoryview(bytes_)
+        if view.format != 'B':
+            # Index the buffer by bytes rather than by its items, such as of an `array.array`.
+            view = view.cast('B')
+        self.view = view
+        self.position = 0
+
+    def read(self, size: int = -1) -> memoryview:
+        position = self.position
+        chunk = self.view[position:position + size] if size >= 0 else self.view[position:]
+        self.position = position + len(chunk)
+        return chunk
+
+    def tell(self) -> int:
+        return self.position
+
 
 class Dumps(ABC):
+    __slots__ = ()
+
     @abstractmethod
-    def dump(self, value: Any, io: IO):
+    def dump(self, value: Any, io: WriteIO):
         """
         Serializes a value into a file-like object.
         """
@@ -22,22 +70,23 @@ class Dumps(ABC):
         """
         Serializes a value into a byte string
         """
-        with BytesIO() as io:
-            self.dump(value, io)
-            return io.getvalue()
+        io = BytesIO()
+        self.dump(value, io)
+        return io.getvalue()
 
 
 class Loads(ABC):
+    __slots__ = ()
+
     @abstractmethod
-    def load(self, io: IO) -> Any:
+    def load(self, io: ReadIO) -> Any:
         """
         Deserializes a value from a file-like object.
         """
         raise NotImplementedError()
 
-    def loads(self, bytes_: bytes) -> Any:
+    def loads(self, bytes_: BytesLike) -> Any:
         """
         Deserializes a value from a byte string.
         """
-        with BytesIO(bytes_) as io:
-            return self.load(io)
+        return self.load(BytesReader(bytes_))
@@ -9,11 +9,11 @@ from abc import ABC
 from enum import IntEnum
 from itertools import count
 from struct import pack, unpack
-from typing import Any, Dict, Type
+from typing import Any, Dict, Optional, Type
 
 from pure_protobuf import types
 from pure_protobuf.enums import WireType
-from pure_protobuf.io_ import IO, Dumps, Loads
+from pure_protobuf.io_ import BytesReader, Dumps, Loads, ReadIO, WriteIO
 
 
 # TODO: add type argument, see also https://github.com/eigenein/protobuf/issues/27
@@ -22,6 +22,10 @@ class Serializer(Dumps, Loads, ABC):
     # May be overridden by a wrapping serializer.
     wire_type: WireType
 
+    # `struct` and `array` type code of a sized numeric value, if any.
+    # Allows repeated values to be converted in bulk and stored in an `array.array`.
+    typecode: Optional[str] = None
+
     def validate(self, value: Any):
         """
         Validates the value. Raises an exception if value incorrect.
@@ -47,10 +51,10 @@ class UnsignedVarintSerializer(Serializer):
         if not isinstance(value, int) or value < 0:
             raise ValueError('a non-negative integer is expected')
 
-    def dump(self, value: Any, io: IO):
+    def dump(self, value: Any, io: WriteIO):
         write_varint(value, io)
 
-    def load(self, io: IO) -> Any:
+    def load(self, io: ReadIO) -> Any:
         return read_varint(io)
 
 
@@ -69,10 +73,10 @@ class SignedVarintSerializer(Serializer):
         if not isinstance(value, int):
             raise ValueError('an integer is expected')
 
-    def dump(self, value: Any, io: IO):
+    def dump(self, value: Any, io: WriteIO):
         return unsigned_varint_serializer.dump(abs(value) * 2 - (value < 0), io)
 
-    def load(self, io: IO) -> Any:
+    def load(self, io: ReadIO) -> Any:
         # See also: https://stackoverflow.com/a/2211086/359730
         n = unsigned_varint_serializer.load(io)
         return (n >> 1) ^ (-(n & 1))
@@ -95,18 +99,31 @@ class BytesSerializer(Serializer):
         except TypeError:
             raise ValueError(f'a bytes-like object is required, not `{type(value)}`')
 
-    def dump(self, value: Any, io: IO):
+    def dump(self, value: Any, io: WriteIO):
         unsigned_varint_serializer.dump(len(value), io)
         io.write(value)
 
-    def load(self, io: IO) -> Any:
+    def load(self, io: ReadIO) -> Any:
         length = unsigned_varint_serializer.load(io)
-        return io.read(length)
+        return bytes(io.read(length))
 
 
 bytes_serializer = BytesSerializer()
 
 
+class LazyBytesSerializer(BytesSerializer):
+    """
+    Deserializes a byte string as a `memoryview` of the input buffer, without copying it.
+    """
+
+    def load(self, io: ReadIO) -> Any:
+        length = unsigned_varint_serializer.load(io)
+        return io.read(length)
+
+
+lazy_bytes_serializer = LazyBytesSerializer()
+
+
 class StringSerializer(Serializer):
     """
     Serializes a UTF8-encoded string.
@@ -118,10 +135,10 @@ class StringSerializer(Serializer):
         if not isinstance(value, str):
             raise ValueError('a string is expected')
 
-    def dump(self, value: Any, io: IO):
+    def dump(self, value: Any, io: WriteIO):
         bytes_serializer.dump(value.encode('utf-8'), io)
 
-    def load(self, io: IO) -> Any:
+    def load(self, io: ReadIO) -> Any:
         return bytes_serializer.load(io).decode('utf-8')
 
 
@@ -131,16 +148,17 @@ class UnsignedInt32Serializer(Serializer):
     """
 
     wire_type = unsigned_varint_serializer.wire_type
+    typecode = 'I'
 
     def validate(self, value: Any):
         unsigned_varint_serializer.validate(value)
         if not 0 <= value <= 0xFFFFFFFF:
             raise ValueError('value is out of 32-bit unsigned integer range')
 
-    def dump(self, value: Any, io: IO):
+    def dump(self, value: Any, io: WriteIO):
         unsigned_varint_serializer.dump(value, io)
 
-    def load(self, io: IO) -> Any:
+    def load(self, io: ReadIO) -> Any:
         return unsigned_varint_serializer.load(io)
 
 
@@ -150,16 +168,17 @@ class UnsignedInt64Serializer(Serializer):
     """
 
     wire_type = unsigned_varint_serializer.wire_type
+    typecode = 'Q'
 
     def validate(self, value: Any):
         unsigned_varint_serializer.validate(value)
         if not 0 <= value <= 0xFFFFFFFF_FFFFFFFF:
             raise ValueError('value is out of 64-bit unsigned integer range')
 
-    def dump(self, value: Any, io: IO):
+    def dump(self, value: Any, io: WriteIO):
         unsigned_varint_serializer.dump(value, io)
 
-    def load(self, io: IO) -> Any:
+    def load(self, io: ReadIO) -> Any:
         return unsigned_varint_serializer.load(io)
 
 
@@ -169,16 +188,17 @@ class SignedInt32Serializer(Serializer):
     """
 
     wire_type = signed_varint_serializer.wire_type
+    typecode = 'i'
 
     def validate(self, value: Any):
         signed_varint_serializer.validate(value)
         if not -0x7FFFFFFF <= value <= 0x7FFFFFFF:
             raise ValueError('value is out of 32-bit signed integer range')
 
-    def dump(self, value: Any, io: IO):
+    def dump(self, value: Any, io: WriteIO):
         signed_varint_serializer.dump(value, io)
 
-    def load(self, io: IO) -> Any:
+    def load(self, io: ReadIO) -> Any:
         return signed_varint_serializer.load(io)
 
 
@@ -188,16 +208,17 @@ class SignedInt64Serializer(Serializer):
     """
 
     wire_type = signed_varint_serializer.wire_type
+    typecode = 'q'
 
     def validate(self, value: Any):
         signed_varint_serializer.validate(value)
         if not -0x7FFFFFFF_FFFFFFFF <= value <= 0x7FFFFFFF_FFFFFFFF:
             raise ValueError('value is out of 64-bit signed integer range')
 
-    def dump(self, value: Any, io: IO):
+    def dump(self, value: Any, io: WriteIO):
         signed_varint_serializer.dump(value, io)
 
-    def load(self, io: IO) -> Any:
+    def load(self, io: ReadIO) -> Any:
         return signed_varint_serializer.load(io)
 
 
@@ -213,10 +234,10 @@ class BooleanSerializer(Serializer):
         if not isinstance(value, bool):
             raise ValueError('a boolean is expected')
 
-    def dump(self, value: Any, io: IO):
+    def dump(self, value: Any, io: WriteIO):
         io.write(b'\x01' if value else b'\x00')
 
-    def load(self, io: IO) -> Any:
+    def load(self, io: ReadIO) -> Any:
         return bool(unsigned_varint_serializer.load(io))
 
 
@@ -227,15 +248,16 @@ class SignedFixed32Serializer(Serializer):
     """
 
     wire_type = WireType.LONG
+    typecode = 'i'
 
     def validate(self, value: Any):
         if not isinstance(value, int):
             raise ValueError('an integer is expected')
 
-    def dump(self, value: Any, io: IO):
+    def dump(self, value: Any, io: WriteIO):
         io.write(pack('<i', value))
 
-    def load(self, io: IO) -> Any:
+    def load(self, io: ReadIO) -> Any:
         return unpack('<i', io.read(4))[0]
 
 
@@ -246,15 +268,16 @@ class UnsignedFixed32Serializer(Serializer):
     """
 
     wire_type = WireType.LONG
+    typecode = 'I'
 
     def validate(self, value: Any):
         if not isinstance(value, int):
             raise ValueError('an integer is expected')
 
-    def dump(self, value: Any, io: IO):
+    def dump(self, value: Any, io: WriteIO):
         io.write(pack('<I', value))
 
-    def load(self, io: IO) -> Any:
+    def load(self, io: ReadIO) -> Any:
         return unpack('<I', io.read(4))[0]
 
 
@@ -265,15 +288,16 @@ class SignedFixed64Serializer(Serializer):
     """
 
     wire_type = WireType.LONG_LONG
+    typecode = 'q'
 
     def validate(self, value: Any):
         if not isinstance(value, int):
             raise ValueError('an integer is expected')
 
-    def dump(self, value: Any, io: IO):
+    def dump(self, value: Any, io: WriteIO):
         io.write(pack('<q', value))
 
-    def load(self, io: IO) -> Any:
+    def load(self, io: ReadIO) -> Any:
         return unpack('<q', io.read(8))[0]
 
 
@@ -284,15 +308,16 @@ class UnsignedFixed64Serializer(Serializer):
     """
 
     wire_type = WireType.LONG_LONG
+    typecode = 'Q'
 
     def validate(self, value: Any):
         if not isinstance(value, int):
             raise ValueError('an integer is expected')
 
-    def dump(self, value: Any, io: IO):
+    def dump(self, value: Any, io: WriteIO):
         io.write(pack('<Q', value))
 
-    def load(self, io: IO) -> Any:
+    def load(self, io: ReadIO) -> Any:
         return unpack('<Q', io.read(8))[0]
 
 
@@ -303,15 +328,16 @@ class FloatSerializer(Serializer):
     """
 
     wire_type = WireType.LONG
+    typecode = 'f'
 
     def validate(self, value: Any):
         if not isinstance(value, float):
             raise ValueError('a floating-point value is expected')
 
-    def dump(self, value: Any, io: IO):
+    def dump(self, value: Any, io: WriteIO):
         io.write(pack('<f', value))
 
-    def load(self, io: IO) -> Any:
+    def load(self, io: ReadIO) -> Any:
         return unpack('<f', io.read(4))[0]
 
 
@@ -322,15 +348,16 @@ class DoubleSerializer(Serializer):
     """
 
     wire_type = WireType.LONG_LONG
+    typecode = 'd'
 
     def validate(self, value: Any):
         if not isinstance(value, float):
             raise ValueError('a floating-point value is expected')
 
-    def dump(self, value: Any, io: IO):
+    def dump(self, value: Any, io: WriteIO):
         io.write(pack('<d', value))
 
-    def load(self, io: IO) -> Any:
+    def load(self, io: ReadIO) -> Any:
         return unpack('<d', io.read(8))[0]
 
 
@@ -349,10 +376,10 @@ class IntEnumSerializer(Serializer):
         if not isinstance(value, self.type_):
             raise ValueError(f'{self.type_} instance is expected, got {type(value)}')
 
-    def dump(self, value: Any, io: IO):
+    def dump(self, value: Any, io: WriteIO):
         unsigned_varint_serializer.dump(value, io)
 
-    def load(self, io: IO):
+    def load(self, io: ReadIO):
         return self.type_(unsigned_varint_serializer.load(io))
 
 
@@ -369,32 +396,38 @@ class MessageSerializer(Serializer):
     def validate(self, value: Any):
         if not isinstance(value, self.type_):
             raise ValueError(f'{self.type_} is expected, but got {type(value)}')
-        for field_ in value.__protobuf_fields__.values():
+        for field_ in value.__protobuf_fields_list__:
             field_.validate(getattr(value, field_.name))
 
-    def dump(self, value: Any, io: IO):
-        for number, field_ in value.__protobuf_fields__.items():
+    def dump(self, value: Any, io: WriteIO):
+        for field_ in value.__protobuf_fields_list__:
             field_value = getattr(value, field_.name)
             try:
                 field_.dump(field_value, io)
             except (ValueError, struct.error) as e:
                 raise ValueError(f'field `{field_.name}`: {e}, got `{field_value}`') from e
 
-    def load(self, io: IO) -> Any:
+    def load(self, io: ReadIO) -> Any:
         values: Dict[str, Any] = {}
+        fields, parse_table = self.type_.__protobuf_fields__, self.type_.__protobuf_parse_table__
+        parse_table_size = len(parse_table)
         while True:
             try:
                 key = unsigned_varint_serializer.load(io)
             except ValueError:
                 break
-            wire_type = WireType(key & 0b111)
-            field = self.type_.__protobuf_fields__.get(key >> 3)
-            if field is not None:
-                old_value = values.get(field.name)
-                new_value = field.load(wire_type, io)
-                values[field.name] = field.merge(old_value, new_value)
+            entry = parse_table[key] if key < parse_table_size else None
+            if entry is not None:
+                field, wire_type = entry
             else:
-                SKIP[wire_type](io)
+                # Large field number, unexpected wire type or unknown field.
+                wire_type = WireType(key & 0b111)
+                field = fields.get(key >> 3)
+                if field is None:
+                    SKIP[wire_type](io)
+                    continue
+            name = field.name
+            values[name] = field.merge(values.get(name), field.load(wire_type, io))
         return self.type_(**values)
 
     def merge(self, old_value: Any, new_value: Any) -> Any:
@@ -421,22 +454,29 @@ class PackingSerializer(Serializer):
     def validate(self, value: Any):
         self.inner.validate(value)
 
-    def dump(self, value: Any, io: IO):
+    def dump(self, value: Any, io: WriteIO):
         bytes_serializer.dump(self.inner.dumps(value), io)
 
-    def load(self, io: IO) -> Any:
-        return self.inner.loads(bytes_serializer.load(io))
+    def load(self, io: ReadIO) -> Any:
+        # Pass the payload through without copying it.
+        return self.inner.loads(io.read(unsigned_varint_serializer.load(io)))
 
     def merge(self, old_value: Any, new_value: Any) -> Any:
         return self.inner.merge(old_value, new_value)
 
 
-def read_varint(io: IO) -> types.uint:
+def read_varint(io: ReadIO) -> types.uint:
     """
     Read unsigned `VarInt` from a file-like object.
     """
-    value = 0
-    for shift in count(0, 7):
+    if type(io) is BytesReader:
+        return read_varint_from_view(io)
+    byte, = io.read(1)
+    if not byte & 0x80:
+        # Fast path: single-byte value, which is the case for most keys and lengths.
+        return types.uint(byte)
+    value = byte & 0x7F
+    for shift in count(7, 7):
         byte, = io.read(1)
         value |= (byte & 0x7F) << shift
         if not byte & 0x80:
@@ -444,30 +484,123 @@ def read_varint(io: IO) -> types.uint:
     assert False, 'unreachable code'
 
 
-def write_varint(value: types.uint, io: IO):
+def read_varint_from_view(reader: BytesReader) -> types.uint:
+    """
+    Read unsigned `VarInt` by indexing the reader's buffer directly, without slicing it byte by byte.
+    """
+    view, position = reader.view, reader.position
+    try:
+        byte = view[position]
+        if byte < 0x80:
+            # Fast path: single-byte value.
+            reader.position = position + 1
+            return types.uint(byte)
+        next_byte = view[position + 1]
+        if next_byte < 0x80:
+            # Fast path: two-byte value.
+            reader.position = position + 2
+            return types.uint((byte & 0x7F) | (next_byte << 7))
+        # Unrolled up to 28 bits, which covers the rest of typical 32-bit values.
+        value = (byte & 0x7F) | ((next_byte & 0x7F) << 7)
+        byte = view[position + 2]
+        value |= (byte & 0x7F) << 14
+        if byte < 0x80:
+            reader.position = position + 3
+            return types.uint(value)
+        byte = view[position + 3]
+        value |= (byte & 0x7F) << 21
+        if byte < 0x80:
+            reader.position = position + 4
+            return types.uint(value)
+        shift = 28
+        position += 4
+        while True:
+            byte = view[position]
+            position += 1
+            value |= (byte & 0x7F) << shift
+            if not byte & 0x80:
+                break
+            shift += 7
+    except IndexError:
+        raise ValueError('unexpected end of input')
+    reader.position = position
+    return types.uint(value)
+
+
+def write_varint(value: types.uint, io: WriteIO):
     """
     Write unsigned `VarInt` to a file-like object.
     """
+    if value < 0x80:
+        if value >= 0:
+            # Fast path: single-byte value.
+            io.write(SINGLE_BYTES[value])
+            return
+    elif value < 0x4000:
+        # Fast path: two-byte value.
+        io.write(bytes((value & 0x7F | 0x80, value >> 7)))
+        return
     while value > 0x7F:
         io.write(bytes((value & 0x7F | 0x80,)))
         value >>= 7  # type: ignore
     io.write(bytes((value,)))
 
 
-def skip_varint(io: IO):
+# Pre-built single-byte strings, indexed by their value.
+SINGLE_BYTES = tuple(bytes((byte,)) for byte in range(0x80))
+
+
+def accelerated_read_varint_from_view(reader: BytesReader) -> types.uint:
+    """
+    Read unsigned `VarInt` with the compiled accelerator.
+    Falls back to the pure Python implementation for values which don't fit into 64 bits.
+    """
+    try:
+        value, reader.position = decode_varint(reader.view, reader.position)
+    except OverflowError:
+        return pure_read_varint_from_view(reader)
+    return types.uint(value)
+
+
+def accelerated_write_varint(value: types.uint, io: WriteIO):
+    """
+    Write unsigned `VarInt` with the compiled accelerator.
+    Falls back to the pure Python implementation for values which don't fit into 64 bits.
+    """
+    try:
+        encoded = encode_varint(value)
+    except OverflowError:
+        pure_write_varint(value, io)
+    else:
+        io.write(encoded)
+
+
+pure_read_varint_from_view, pure_write_varint = read_varint_from_view, write_varint
+
+try:
+    from pure_protobuf._fast import decode_varint, encode_varint
+except ImportError:
+    # The compiled accelerator is optional and may not be built.
+    pass
+else:
+    read_varint_from_view = accelerated_read_varint_from_view  # type: ignore  # noqa: F811
+    write_varint = accelerated_write_varint  # type: ignore  # noqa: F811
+
+
+def skip_varint(io: ReadIO):
     while io.read(1)[0] & 0x80:
         pass
 
 
-def skip_fixed_32(io: IO):
+def skip_fixed_32(io: ReadIO):
     io.read(4)
 
 
-def skip_fixed_64(io: IO):
+def skip_fixed_64(io: ReadIO):
     io.read(8)
 
 
-def skip_bytes(io: IO):
+def skip_bytes(io: ReadIO):
     io.read(unsigned_varint_serializer.load(io))
 
 
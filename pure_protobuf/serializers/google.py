@@ -8,7 +8,7 @@ from math import modf
 from typing import Any, Tuple
 
 from pure_protobuf.dataclasses_ import SERIALIZERS, Message
-from pure_protobuf.io_ import IO
+from pure_protobuf.io_ import ReadIO, WriteIO
 from pure_protobuf.serializers import MessageSerializer, PackingSerializer
 from pure_protobuf.types import int32, int64
 from pure_protobuf.types.google import Any_, Duration, Timestamp
@@ -26,10 +26,10 @@ class TimestampSerializer(MessageSerializer):
         if not isinstance(value, datetime):
             raise ValueError(f'`datetime` expected, got `{type(value)}`')
 
-    def dump(self, value: Any, io: IO):
+    def dump(self, value: Any, io: WriteIO):
         super().dump(Timestamp(*split_seconds(value.timestamp())), io)
 
-    def load(self, io: IO) -> Any:
+    def load(self, io: ReadIO) -> Any:
         timestamp: Timestamp = super().load(io)
         return datetime.fromtimestamp(unsplit_seconds(timestamp.seconds, timestamp.nanos), tz=timezone.utc)
 
@@ -46,10 +46,10 @@ class DurationSerializer(MessageSerializer):
         if not isinstance(value, timedelta):
             raise ValueError(f'`timedelta` expected, got `{type(value)}`')
 
-    def dump(self, value: Any, io: IO):
+    def dump(self, value: Any, io: WriteIO):
         super().dump(Duration(*split_seconds(value.total_seconds())), io)
 
-    def load(self, io: IO) -> Any:
+    def load(self, io: ReadIO) -> Any:
         duration: Duration = super().load(io)
         return timedelta(seconds=unsplit_seconds(duration.seconds, duration.nanos))
 
@@ -68,10 +68,10 @@ class AnySerializer(MessageSerializer):
         if not isinstance(value, Message):
             raise ValueError(f'message type is expected, got `{type(value)}`')
 
-    def dump(self, value: Any, io: IO):
+    def dump(self, value: Any, io: WriteIO):
         super().dump(Any_(type_url=value.type_url, value=value.dumps()), io)
 
-    def load(self, io: IO) -> Any:
+    def load(self, io: ReadIO) -> Any:
         # Load instance of `Any` message type.
         any_ = super().load(io)
         # Get module name and class name from the type URL.
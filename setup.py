@@ -1,4 +1,15 @@
-from setuptools import find_packages, setup
+from setuptools import Extension, find_packages, setup
+
+try:
+    from Cython.Build import cythonize
+except ImportError:
+    # The compiled accelerator is optional, fall back to the pure Python implementation.
+    ext_modules = []
+else:
+    ext_modules = cythonize(
+        [Extension('pure_protobuf._fast', ['pure_protobuf/_fast.pyx'], optional=True)],
+        compiler_directives={'language_level': 3},
+    )
 
 setup(
     name='pure-protobuf',
@@ -10,6 +21,7 @@ setup(
     author_email='eigenein@gmail.com',
     url='https://github.com/eigenein/protobuf',
     packages=find_packages(exclude=['tests*']),
+    ext_modules=ext_modules,
     zip_safe=True,
     extras_require={
         'dev': [
@@ -21,6 +33,7 @@ setup(
             'build',
             'twine',
             'pytest-benchmark',
+            'cython',
         ],
     },
     classifiers=[
@@ -2,14 +2,21 @@
 `pure-protobuf` contributors © 2011-2022
 """
 
+import gc
+import sys
+import weakref
+from array import array
 from dataclasses import dataclass
-from typing import Any, ByteString, List, Optional, Tuple
+from enum import IntEnum
+from io import BytesIO
+from typing import Any, ByteString, Iterable, List, Optional, Tuple, Union
 
 from pytest import mark, raises
 
-from pure_protobuf import types
+from pure_protobuf import set_validation, types
 # noinspection PyProtectedMember
-from pure_protobuf.dataclasses_ import field, make_field, message
+from pure_protobuf.dataclasses_ import decompose_type, field, make_field, message
+from pure_protobuf.enums import WireType
 
 
 @mark.parametrize('number, name, type_, value, expected', [
@@ -38,6 +45,19 @@ def test_make_field_value_error(number: int, name: str, type_: Any, value: Any):
         field_.validate(value)
 
 
+@mark.parametrize('type_, expected', [
+    (int, (False, False, int)),
+    (Optional[int], (True, False, int)),
+    (Union[None, int], (True, False, int)),
+    (Union[int, str], (False, False, Union[int, str])),
+    (List[int], (False, True, int)),
+    (Iterable[int], (False, True, int)),
+    (Optional[List[int]], (True, True, int)),
+])
+def test_decompose_type(type_: Any, expected: Tuple[bool, bool, Any]):
+    assert decompose_type(type_) == expected
+
+
 @mark.parametrize('type_', [
     Tuple[int, str],
 ])
@@ -46,6 +66,22 @@ def test_make_field_type_error(type_: Any):
         make_field(1, 'a', type_)
 
 
+def test_make_field_lazy_bytes_type_error():
+    with raises(TypeError):
+        make_field(1, 'a', str, lazy_bytes=True)
+
+
+@mark.parametrize('type_, container', [
+    (types.int32, array),
+    (List[str], array),
+    (List[bool], array),
+    (List[types.int32], tuple),
+])
+def test_make_field_container_type_error(type_: Any, container: type):
+    with raises(TypeError):
+        make_field(1, 'a', type_, container=container)
+
+
 def test_serialize_unpacked_repeated_field():
     @message
     @dataclass
@@ -53,3 +89,211 @@ def test_serialize_unpacked_repeated_field():
         foo: List[types.uint32] = field(1, packed=False)
 
     assert Message(foo=[types.uint32(4), types.uint32(5)]).dumps() == b'\x08\x04\x08\x05'
+
+
+def test_make_field_cached():
+    assert make_field(1, 'a', List[types.int32]) is make_field(1, 'a', List[types.int32])
+
+
+def test_user_types_are_not_kept_alive():
+    class Enum_(IntEnum):
+        A = 0
+
+    @message
+    @dataclass
+    class Inner:
+        a: types.uint32 = field(1)
+
+    @message
+    @dataclass
+    class Outer:
+        inner: Inner = field(1)
+        enum: Enum_ = field(2)
+
+    references = [weakref.ref(Enum_), weakref.ref(Inner), weakref.ref(Outer)]
+    del Enum_, Inner, Outer
+    gc.collect()
+    assert [reference() for reference in references] == [None, None, None]
+
+
+def test_forward_ref():
+    @message
+    @dataclass
+    class Message:
+        foo: 'types.uint32' = field(1)
+        bar: List['types.uint32'] = field(2)
+
+    assert Message(foo=types.uint32(1), bar=[types.uint32(2)]).dumps() == b'\x08\x01\x12\x01\x02'
+
+
+@mark.skipif(sys.version_info < (3, 9), reason='`Annotated` requires Python 3.9')
+def test_annotated():
+    from typing import Annotated
+
+    @message
+    @dataclass
+    class Message:
+        foo: Annotated[types.uint32, 'foo'] = field(1)
+        bar: List[Annotated[types.uint32, 'bar']] = field(2)
+
+    message_ = Message(foo=types.uint32(1), bar=[types.uint32(2)])
+    assert message_.dumps() == b'\x08\x01\x12\x01\x02'
+    assert Message.loads(message_.dumps()) == message_
+
+
+def test_inherited_fields():
+    @dataclass
+    class Base:
+        foo: types.uint32 = field(1)
+
+    @message
+    @dataclass
+    class Message(Base):
+        bar: str = field(2)
+
+    assert Message(foo=types.uint32(1), bar='a').dumps() == b'\x08\x01\x12\x01a'
+
+
+def test_merge_from():
+    @message
+    @dataclass
+    class Message:
+        foo: Optional[types.uint32] = field(1, default=None)
+        bar: List[types.uint32] = field(2, default_factory=list)
+
+    stub = Message.merge_from
+    message_ = Message(foo=types.uint32(1), bar=[types.uint32(2)])
+    message_.merge_from(Message(foo=types.uint32(3), bar=[types.uint32(4)]))
+    assert message_ == Message(foo=types.uint32(3), bar=[types.uint32(2), types.uint32(4)])
+
+    # The method is generated on the first call.
+    assert Message.merge_from is not stub
+    message_.merge_from(Message(foo=types.uint32(5), bar=[types.uint32(6)]))
+    assert message_ == Message(foo=types.uint32(5), bar=[types.uint32(2), types.uint32(4), types.uint32(6)])
+
+
+def test_merge_from_empty():
+    @message
+    @dataclass
+    class Message:
+        pass
+
+    Message().merge_from(Message())
+
+
+def test_dump_into():
+    @message
+    @dataclass
+    class Message:
+        foo: types.uint32 = field(1)
+
+    buffer = bytearray(b'\x01')
+    Message(foo=types.uint32(150)).dump_into(buffer)
+    Message(foo=types.uint32(2)).dump_into(buffer)
+    assert buffer == b'\x01\x08\x96\x01\x08\x02'
+
+
+def test_lazy_bytes():
+    @message
+    @dataclass
+    class Message:
+        foo: bytes = field(1, lazy_bytes=True)
+
+    bytes_ = b'\x0A\x07testing'
+    message_ = Message.loads(bytes_)
+    assert isinstance(message_.foo, memoryview)
+    assert message_.foo.obj is bytes_
+    assert message_ == Message(foo=b'testing')
+    assert message_.dumps() == bytes_
+
+
+def test_large_field_number():
+    @message
+    @dataclass
+    class Message:
+        foo: types.uint32 = field(1)
+        bar: types.uint32 = field(1000)
+
+    assert len(Message.__protobuf_parse_table__) == 9  # type: ignore
+    assert Message.loads(b'\x08\x01\xC0\x3E\x02\x10\x03') == Message(foo=types.uint32(1), bar=types.uint32(2))
+
+
+def test_array_container():
+    @message
+    @dataclass
+    class Message:
+        foo: List[types.sint64] = field(1, container=array)
+        bar: List[types.double] = field(2, container=array)
+        baz: List[types.uint32] = field(3, container=array, packed=False)
+
+    bytes_ = b'\x0A\x03\x06\xAB\x02' b'\x12\x08\x00\x00\x00\x00\x00\x00\xF8\x3F' b'\x18\x01\x18\x02'
+    message_ = Message.loads(bytes_ + b'\x0A\x01\x0A')
+    assert message_.foo == array('q', [3, -150, 5])
+    assert message_.bar == array('d', [1.5])
+    assert message_.baz == array('I', [1, 2])
+    assert Message.loads(message_.dumps()) == message_
+
+
+def test_parse_table():
+    @message
+    @dataclass
+    class Message:
+        foo: types.uint32 = field(1)
+        bar: List[types.uint32] = field(2)
+
+    parse_table = Message.__protobuf_parse_table__  # type: ignore
+    assert len(parse_table) == 19
+    assert parse_table[0x08] == (Message.__protobuf_fields__[1], WireType.VARINT)  # type: ignore
+    assert parse_table[0x10] == (Message.__protobuf_fields__[2], WireType.VARINT)  # type: ignore
+    assert parse_table[0x12] == (Message.__protobuf_fields__[2], WireType.BYTES)  # type: ignore
+    assert parse_table.count(None) == 16
+    expected = Message(foo=types.uint32(3), bar=[types.uint32(1), types.uint32(2)])
+    assert Message.loads(b'\x08\x03\x10\x01\x12\x01\x02') == expected
+
+    with raises(ValueError):
+        # Unexpected wire type.
+        Message.loads(b'\x0A\x00')
+
+
+def test_skip_validation():
+    @message
+    @dataclass
+    class Message:
+        foo: types.int32 = field(1)
+
+    message_ = Message(foo=types.int32(1 << 32))
+    expected = b'\x08\x80\x80\x80\x80\x10'
+    with raises(ValueError):
+        message_.dumps()
+    assert message_.dumps(validate=False) == expected
+
+    set_validation(False)
+    try:
+        assert message_.dumps() == expected
+        buffer = bytearray()
+        message_.dump_into(buffer)
+        assert buffer == expected
+        with raises(ValueError):
+            message_.dump(BytesIO(), validate=True)
+    finally:
+        set_validation(True)
+
+
+def test_undecorated_subclass_validate():
+    @message
+    @dataclass
+    class Message:
+        foo: types.uint32 = field(1)
+
+    class Subclass(Message):
+        def validate(self):
+            raise ValueError('invalid')
+
+    message_ = Subclass(foo=types.uint32(1))
+    with raises(ValueError):
+        message_.dumps()
+    with raises(ValueError):
+        message_.dump(BytesIO())
+    with raises(ValueError):
+        message_.dump_into(bytearray())
+    assert message_.dumps(validate=False) == b'\x08\x01'
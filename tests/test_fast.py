@@ -0,0 +1,54 @@
+"""
+Tests the optional compiled accelerator.
+
+`pure-protobuf` contributors © 2011-2022
+"""
+
+from pytest import importorskip, mark, raises
+
+from tests import _test_id
+from tests.test_serializers import UNSIGNED_VARINT_TESTS
+
+fast = importorskip('pure_protobuf._fast')
+
+
+@mark.parametrize('value, bytes_', UNSIGNED_VARINT_TESTS, ids=_test_id)
+def test_encode_varint(value: int, bytes_: bytes):
+    assert fast.encode_varint(value) == bytes_
+
+
+@mark.parametrize('value, bytes_', UNSIGNED_VARINT_TESTS, ids=_test_id)
+def test_decode_varint(value: int, bytes_: bytes):
+    assert fast.decode_varint(memoryview(b'\x01' + bytes_ + b'\x01'), 1) == (value, len(bytes_) + 1)
+
+
+@mark.parametrize('value', [0, 150, (1 << 56) - 1, 1 << 56, (1 << 63) + 1])
+def test_decode_varint_window(value: int):
+    # Enough trailing bytes for the 8-byte window, including the stop bits.
+    bytes_ = fast.encode_varint(value)
+    for padding in (b'\x00' * 8, b'\xFF' * 8):
+        assert fast.decode_varint(bytes_ + padding, 0) == (value, len(bytes_))
+
+
+@mark.parametrize('value', [-1, 1 << 64])
+def test_encode_varint_overflow(value: int):
+    with raises(OverflowError):
+        fast.encode_varint(value)
+
+
+def test_decode_varint_overflow():
+    with raises(OverflowError):
+        fast.decode_varint(b'\xFF\xFF\xFF\xFF\xFF\xFF\xFF\xFF\xFF\x02', 0)
+
+
+@mark.parametrize('bytes_', [b'', b'\x8E'], ids=_test_id)
+def test_decode_varint_eof(bytes_: bytes):
+    with raises(ValueError):
+        fast.decode_varint(bytes_, 0)
+
+
+def test_varints():
+    values = [value for value, _ in UNSIGNED_VARINT_TESTS]
+    bytes_ = b''.join(bytes_ for _, bytes_ in UNSIGNED_VARINT_TESTS)
+    assert fast.encode_varints(values) == bytes_
+    assert fast.decode_varints(bytes_) == values
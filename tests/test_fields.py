@@ -1,17 +1,28 @@
 """
 `pure-protobuf` contributors © 2011-2019
 """
+from array import array
 from io import BytesIO
 from typing import Any, List, Optional
 
 from pytest import mark, raises
 
 from pure_protobuf.enums import WireType
-from pure_protobuf.fields import NonRepeatedField, PackedRepeatedField, UnpackedRepeatedField
+from pure_protobuf.fields import (
+    Field,
+    NonRepeatedField,
+    PackedFixedRepeatedField,
+    PackedRepeatedField,
+    PackedUnsignedVarintRepeatedField,
+    UnpackedRepeatedField,
+)
 from pure_protobuf.serializers import (
     BytesSerializer,
+    DoubleSerializer,
     Serializer,
     StringSerializer,
+    UnsignedFixed32Serializer,
+    UnsignedInt32Serializer,
     UnsignedVarintSerializer,
     unsigned_varint_serializer,
 )
@@ -27,6 +38,15 @@ def test_non_repeated_field(value: bytes, bytes_: bytes):
         assert field.load(WireType(UnsignedVarintSerializer().load(io) & 0b111), io) == value
 
 
+@mark.parametrize('field, expected', [
+    (NonRepeatedField(1, 'a', UnsignedVarintSerializer(), False), b'\x08'),
+    (NonRepeatedField(16, 'a', BytesSerializer(), False), b'\x82\x01'),
+    (PackedRepeatedField(2, 'a', UnsignedVarintSerializer()), b'\x12'),
+])
+def test_encoded_key(field: Field, expected: bytes):
+    assert field.encoded_key == expected
+
+
 @mark.parametrize('value, expected', [
     (1, b'\x08\x01'),
     (None, b''),
@@ -55,6 +75,56 @@ def test_packed_repeated_field(value: List[int], bytes_: bytes):
         assert field.load(WireType(UnsignedVarintSerializer().load(io) & 0b111), io) == value
 
 
+@mark.parametrize('serializer, value, bytes_', [
+    (UnsignedFixed32Serializer(), [], b'\x0A\x00'),
+    (UnsignedFixed32Serializer(), [1, 2], b'\x0A\x08\x01\x00\x00\x00\x02\x00\x00\x00'),
+    (DoubleSerializer(), [1.5], b'\x0A\x08\x00\x00\x00\x00\x00\x00\xF8\x3F'),
+])
+def test_packed_fixed_repeated_field(serializer: Serializer, value: List[Any], bytes_: bytes):
+    field = PackedFixedRepeatedField(1, 'a', serializer)
+    assert field.dumps(value) == bytes_
+    with BytesIO(bytes_) as io:
+        assert field.load(WireType(UnsignedVarintSerializer().load(io) & 0b111), io) == value
+
+
+def test_packed_fixed_repeated_field_iterable():
+    field = PackedFixedRepeatedField(1, 'a', UnsignedFixed32Serializer())
+    assert field.dumps(iter([1, 2])) == b'\x0A\x08\x01\x00\x00\x00\x02\x00\x00\x00'
+
+
+@mark.parametrize('serializer, value, bytes_', [
+    (UnsignedFixed32Serializer(), array('I'), b'\x0A\x00'),
+    (UnsignedFixed32Serializer(), array('I', [1, 2]), b'\x0A\x08\x01\x00\x00\x00\x02\x00\x00\x00'),
+    (DoubleSerializer(), array('d', [1.5]), b'\x0A\x08\x00\x00\x00\x00\x00\x00\xF8\x3F'),
+])
+def test_packed_fixed_repeated_field_array(serializer: Serializer, value: array, bytes_: bytes):
+    field = PackedFixedRepeatedField(1, 'a', serializer, array)
+    assert field.dumps(value) == bytes_
+    with BytesIO(bytes_) as io:
+        loaded = field.load(WireType(UnsignedVarintSerializer().load(io) & 0b111), io)
+    assert isinstance(loaded, array)
+    assert loaded == value
+
+
+def test_repeated_field_array_out_of_range():
+    field = UnpackedRepeatedField(1, 'a', UnsignedInt32Serializer(), container=array)
+    with raises(ValueError):
+        field.load(WireType.VARINT, BytesIO(b'\xFF\xFF\xFF\xFF\x1F'))
+
+
+@mark.parametrize('container, old_value, new_value, expected', [
+    (array, array('I', [1]), array('I', [2]), array('I', [1, 2])),
+    (array, [1], array('I', [2]), array('I', [1, 2])),
+    (array, array('I', [1]), [2], array('I', [1, 2])),
+    (array, array('Q', [1]), array('I', [2]), array('I', [1, 2])),
+    (list, array('I', [1]), array('I', [2]), [1, 2]),
+])
+def test_repeated_field_merge_container(container: type, old_value: Any, new_value: Any, expected: Any):
+    merged = UnpackedRepeatedField(1, 'a', UnsignedInt32Serializer(), container=container).merge(old_value, new_value)
+    assert type(merged) is type(expected)
+    assert merged == expected
+
+
 @mark.parametrize('serializer, value, bytes_', [
     (unsigned_varint_serializer, [], b''),
     (unsigned_varint_serializer, [3], b'\x08\x03'),
@@ -72,3 +142,17 @@ def test_unpacked_repeated_field_dumps(serializer: Serializer, value: List[Any],
 ])
 def test_unpacked_repeated_field_load(serializer: Serializer, value: List[Any], bytes_: bytes):
     assert UnpackedRepeatedField(1, 'a', serializer).load(serializer.wire_type, BytesIO(bytes_)) == value
+
+
+@mark.skipif(not PackedUnsignedVarintRepeatedField.is_available, reason='compiled accelerator is not available')
+@mark.parametrize('value, bytes_', [
+    ([], b'\x0A\x00'),
+    ([4, 150], b'\x0A\x03\x04\x96\x01'),
+    ([1 << 70], b'\x0A\x0B\x80\x80\x80\x80\x80\x80\x80\x80\x80\x80\x01'),
+])
+def test_packed_unsigned_varint_repeated_field(value: List[int], bytes_: bytes):
+    field = PackedUnsignedVarintRepeatedField(1, 'a', UnsignedVarintSerializer())
+    assert field.dumps(value) == bytes_
+    assert field.dumps(iter(value)) == bytes_
+    with BytesIO(bytes_) as io:
+        assert field.load(WireType(UnsignedVarintSerializer().load(io) & 0b111), io) == value
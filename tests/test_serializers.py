@@ -2,6 +2,7 @@
 `pure-protobuf` contributors © 2011-2019
 """
 
+from array import array
 # noinspection PyCompatibility
 from dataclasses import dataclass
 from enum import IntEnum
@@ -11,6 +12,7 @@ from pytest import fixture, mark, raises
 
 from pure_protobuf.dataclasses_ import field, message
 from pure_protobuf.enums import WireType
+from pure_protobuf.io_ import BytesReader
 from pure_protobuf.serializers import (
     BooleanSerializer,
     BytesSerializer,
@@ -30,6 +32,7 @@ from pure_protobuf.serializers import (
     UnsignedInt32Serializer,
     UnsignedInt64Serializer,
     UnsignedVarintSerializer,
+    read_varint,
 )
 from pure_protobuf.types import int32, uint
 from tests import _test_id
@@ -86,8 +89,15 @@ def test_serializer_value_error(serializer_class: Type[Serializer], value: Any):
 UNSIGNED_VARINT_TESTS = [
     (0, b'\x00'),
     (3, b'\x03'),
+    (127, b'\x7F'),
+    (128, b'\x80\x01'),
     (270, b'\x8E\x02'),
+    (16383, b'\xFF\x7F'),
+    (16384, b'\x80\x80\x01'),
     (86942, b'\x9E\xA7\x05'),
+    (0x0FFFFFFF, b'\xFF\xFF\xFF\x7F'),
+    (0x10000000, b'\x80\x80\x80\x80\x01'),
+    (0xFFFFFFFF_FFFFFFFF, b'\xFF\xFF\xFF\xFF\xFF\xFF\xFF\xFF\xFF\x01'),
 ]
 
 
@@ -103,6 +113,35 @@ def test_unsigned_varint_serializer_loads(value: int, bytes_: bytes, benchmark):
     assert benchmark(UnsignedVarintSerializer().loads, bytes_) == value
 
 
+@mark.parametrize('value, bytes_', UNSIGNED_VARINT_TESTS, ids=_test_id)
+def test_read_varint_bytes_reader(value: int, bytes_: bytes):
+    reader = BytesReader(bytes_ + b'\x01')
+    assert read_varint(reader) == value
+    assert reader.tell() == len(bytes_)
+
+
+@mark.parametrize('bytes_', [
+    array('b', [0x08, -0x6A, 0x01, 0x00]),
+    memoryview(b'\x08\x96\x01\x00').cast('H'),
+])
+def test_bytes_reader_item_format(bytes_: Any):
+    reader = BytesReader(bytes_)
+    assert reader.read(1) == b'\x08'
+    assert read_varint(reader) == 150
+    assert reader.tell() == 3
+
+
+def test_write_varint_negative():
+    with raises(ValueError):
+        UnsignedVarintSerializer().dumps(-1)
+
+
+@mark.parametrize('bytes_', [b'', b'\x8E', b'\x8E\x80\x80', b'\x8E\x80\x80\x80\x80'], ids=_test_id)
+def test_read_varint_bytes_reader_eof(bytes_: bytes):
+    with raises(ValueError):
+        read_varint(BytesReader(bytes_))
+
+
 SIGNED_VARINT_TESTS = [
     (0, b'\x00'),
     (-1, b'\x01'),
@@ -22,6 +22,20 @@ def test_type_url(type_: Any, expected: str):
     assert type_.type_url == expected
 
 
+def test_type_url_subclass():
+    @message
+    @dataclass
+    class Test:
+        pass
+
+    @dataclass
+    class Subclass(Test):
+        pass
+
+    assert Subclass.type_url == Subclass().type_url == f'type.googleapis.com/{__name__}.Test'
+    assert Test.type_url == f'type.googleapis.com/{__name__}.Test'
+
+
 def test_datetime():
     @message
     @dataclass